@@ -4,8 +4,9 @@ import click
 from rich.console import Console
 from rich.table import Table
 
-from .nginx_manager import NginxManager
+from .nginx_manager import NginxManager, DEFAULT_RESOLVER
 from .docker_manager import DockerManager
+from .tls_benchmark import TLSBenchmark
 
 console = Console()
 
@@ -172,6 +173,10 @@ def status():
         proxies = nginx_manager.list_proxies()
         console.print(f"[bold]Active Proxies:[/bold] {len(proxies)}")
         
+        # Show whether the HTTPS server is active
+        https_status = "enabled" if nginx_manager.tls_enabled() else "disabled"
+        console.print(f"[bold]HTTPS:[/bold] {https_status}")
+        
         # Test nginx configuration
         if docker_manager.test_nginx_config():
             console.print("[green]✅ Nginx configuration is valid[/green]")
@@ -182,6 +187,29 @@ def status():
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
+@cli.command()
+def migrate():
+    """Move inline proxy locations into nginx/locations/ (one-time upgrade)."""
+    try:
+        nginx_manager = NginxManager()
+        
+        if not nginx_manager.needs_migration():
+            console.print("[green]✅ Proxy locations already live in nginx/locations/[/green]")
+            return
+        
+        if nginx_manager.migrate_locations():
+            console.print("[green]✅ Moved proxy locations to nginx/locations/[/green]")
+            # A reload is not enough: the old container lacks the new volume mounts
+            # and would silently serve no proxies
+            console.print("[yellow]⚠️  Recreate the container to mount the new directories:[/yellow]")
+            console.print("  docker-compose down && docker-compose up -d")
+        else:
+            console.print("[red]❌ Failed to migrate proxy locations![/red]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+
+
 @cli.command()
 def reload():
     """Reload nginx configuration."""
@@ -197,5 +225,161 @@ def reload():
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
+@cli.group()
+def tls():
+    """Manage the HTTPS server."""
+    pass
+
+
+@tls.command()
+@click.option(
+    "--cert", 
+    required=True, 
+    type=click.Path(exists=True, dir_okay=False),
+    help="Certificate file (full chain, PEM)"
+)
+@click.option(
+    "--key", 
+    required=True, 
+    type=click.Path(exists=True, dir_okay=False),
+    help="Private key file (PEM)"
+)
+@click.option(
+    "--server-name", 
+    default="_", 
+    help="Server name for the HTTPS server (e.g., proxy.example.com)"
+)
+@click.option(
+    "--trusted-cert", 
+    type=click.Path(exists=True, dir_okay=False),
+    help="CA chain used to verify stapled OCSP responses"
+)
+@click.option(
+    "--ocsp/--no-ocsp", 
+    default=True, 
+    help="Enable OCSP stapling"
+)
+@click.option(
+    "--resolver", 
+    default=DEFAULT_RESOLVER, 
+    show_default=True, 
+    help="DNS resolvers for fetching OCSP responses (e.g., 127.0.0.11 for Docker DNS)"
+)
+def enable(cert: str, key: str, server_name: str = "_", trusted_cert: str = None, ocsp: bool = True,
+           resolver: str = DEFAULT_RESOLVER):
+    """Enable the HTTPS server with HTTP/2 and session resumption."""
+    try:
+        nginx_manager = NginxManager()
+        docker_manager = DockerManager()
+        
+        success = nginx_manager.enable_tls(cert, key, server_name, trusted_cert, ocsp, resolver)
+        
+        if success:
+            console.print("[green]✅ HTTPS server enabled:[/green]")
+            console.print(f"  Server name: {server_name}")
+            console.print(f"  OCSP stapling: {'on' if ocsp else 'off'}")
+            
+            # Reload nginx configuration
+            if docker_manager.reload_nginx():
+                console.print("[green]✅ Nginx configuration reloaded successfully![/green]")
+            else:
+                console.print("[yellow]⚠️  TLS enabled but nginx reload failed. You may need to restart manually.[/yellow]")
+        else:
+            console.print("[red]❌ Failed to enable TLS![/red]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+
+
+@tls.command(name="rotate-tickets")
+@click.option(
+    "--keep", 
+    default=3, 
+    show_default=True, 
+    help="Number of session ticket keys to keep (newest encrypts, the rest decrypt)"
+)
+def rotate_tickets(keep: int = 3):
+    """Rotate TLS session ticket keys (run periodically, e.g. from cron)."""
+    try:
+        nginx_manager = NginxManager()
+        docker_manager = DockerManager()
+        
+        if nginx_manager.rotate_session_ticket_keys(keep):
+            console.print("[green]✅ Session ticket keys rotated![/green]")
+            
+            # Reload nginx configuration
+            if docker_manager.reload_nginx():
+                console.print("[green]✅ Nginx configuration reloaded successfully![/green]")
+            else:
+                console.print("[yellow]⚠️  Keys rotated but nginx reload failed. You may need to restart manually.[/yellow]")
+        else:
+            console.print("[red]❌ Failed to rotate session ticket keys![/red]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+
+
+@tls.command()
+@click.option(
+    "--host", 
+    default="localhost", 
+    help="Proxy host to connect to"
+)
+@click.option(
+    "--port", 
+    default=443, 
+    show_default=True, 
+    help="Proxy HTTPS port"
+)
+@click.option(
+    "--server-name", 
+    help="SNI server name (defaults to host)"
+)
+@click.option(
+    "--count", 
+    default=20, 
+    show_default=True, 
+    help="Number of handshakes per mode"
+)
+@click.option(
+    "--verify", 
+    is_flag=True, 
+    help="Verify the server certificate"
+)
+def bench(host: str, port: int, server_name: str = None, count: int = 20, verify: bool = False):
+    """Benchmark full vs resumed TLS handshakes."""
+    try:
+        benchmark = TLSBenchmark(host, port, server_name, verify)
+        results = benchmark.run(count)
+        
+        table = Table(title=f"TLS Handshakes ({host}:{port})")
+        table.add_column("Mode", style="cyan", no_wrap=True)
+        table.add_column("Count", justify="right")
+        table.add_column("Mean (ms)", justify="right", style="magenta")
+        table.add_column("p50 (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        
+        for mode in ('full', 'resumed'):
+            stats = results[mode]
+            table.add_row(
+                mode,
+                str(stats['count']),
+                f"{stats['mean_ms']:.2f}",
+                f"{stats['p50_ms']:.2f}",
+                f"{stats['p95_ms']:.2f}"
+            )
+        
+        console.print(table)
+        
+        resumption_rate = results['resumed']['resumption_rate']
+        if resumption_rate == 1:
+            console.print("[green]✅ All sessions were resumed[/green]")
+        else:
+            console.print(f"[yellow]⚠️  Resumption rate: {resumption_rate:.0%}[/yellow]")
+    
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -2,11 +2,45 @@
 
 import os
 import re
+import shutil
+import textwrap
 from pathlib import Path
 from typing import List, Dict, Optional
 from urllib.parse import urlparse
 
 
+# Directory where the ssl/ folder is mounted inside the nginx container
+CONTAINER_SSL_DIR = "/etc/nginx/ssl"
+
+# Directive shared by the HTTP and HTTPS servers to pull in proxy locations
+LOCATIONS_INCLUDE = "include locations/*.conf;"
+
+# DNS resolvers nginx uses to reach OCSP responders
+DEFAULT_RESOLVER = "1.1.1.1 8.8.8.8"
+
+# Matches the HTTPS server section, whether commented out or active
+HTTPS_SERVER_PATTERN = re.compile(
+    r'^(?P<indent>[ \t]*)# HTTPS server[^\n]*\n.*?\n(?P=indent)(?:# )?\}[ \t]*$',
+    re.DOTALL | re.MULTILINE,
+)
+
+# Placeholder for the HTTPS server until `llm-proxy tls enable` is run
+HTTPS_SERVER_STUB = """    # HTTPS server (run `llm-proxy tls enable --cert ... --key ...` to activate)
+    # server {
+    #     listen 443 ssl;
+    #     http2 on;
+    #     server_name your-domain.com;
+    # }"""
+
+# Matches an active (uncommented) inline location block and its comment line
+INLINE_LOCATION_PATTERN = re.compile(
+    r'^(?:[ \t]*\n)?(?P<block>(?:[ \t]*#[^\n]*\n)?[ \t]*location\s+(?P<endpoint>\S+)\s*\{[^}]*\}[ \t]*\n)',
+    re.MULTILINE,
+)
+
+MIGRATION_HINT = "nginx.conf predates shared proxy locations. Run `llm-proxy migrate` first"
+
+
 class NginxManager:
     """Manages nginx configuration for proxy settings."""
     
@@ -18,6 +52,10 @@ class NginxManager:
             # Default to nginx/nginx.conf relative to current working directory
             self.config_path = Path.cwd() / "nginx" / "nginx.conf"
         
+        # Proxy locations and TLS material live next to nginx.conf
+        self.locations_dir = self.config_path.parent / "locations"
+        self.ssl_dir = self.config_path.parent / "ssl"
+        
         if not self.config_path.exists():
             raise FileNotFoundError(f"Nginx configuration file not found: {self.config_path}")
     
@@ -39,6 +77,22 @@ class NginxManager:
             print(f"Error writing config: {e}")
             return False
     
+    def _location_file(self, endpoint: str) -> Path:
+        """Get the location include file for an endpoint."""
+        # Escape everything but letters, digits and hyphens as _XX (hex) so
+        # that different endpoints never share a file, e.g. /a/b/ vs /a_b/
+        # ("_root" can't be produced by the escaping, so "/" gets its own name)
+        clean_name = re.sub(
+            r'[^A-Za-z0-9-]', lambda m: f"_{ord(m.group(0)):02x}", endpoint.strip('/')
+        ) or '_root'
+        return self.locations_dir / f"{clean_name}.conf"
+    
+    def _read_locations(self) -> str:
+        """Read all location include files."""
+        if not self.locations_dir.is_dir():
+            return ""
+        return "\n".join(path.read_text() for path in sorted(self.locations_dir.glob("*.conf")))
+    
     def _parse_upstream_name(self, base_url: str) -> str:
         """Generate upstream name from base URL."""
         parsed = urlparse(base_url)
@@ -109,9 +163,56 @@ class NginxManager:
             proxy_cache_bypass $http_upgrade;
         }}"""
     
+    def needs_migration(self) -> bool:
+        """Check if nginx.conf still uses inline locations instead of shared include files."""
+        return LOCATIONS_INCLUDE not in self._read_config()
+    
+    def migrate_locations(self) -> bool:
+        """Move inline location blocks into include files shared by the HTTP and HTTPS servers."""
+        try:
+            config = self._read_config()
+            
+            # Move active inline locations (except the health check) into files;
+            # the HTTP server comes first, so its copy wins over HTTPS duplicates
+            migrated = set()
+            for match in INLINE_LOCATION_PATTERN.finditer(config):
+                endpoint = match.group('endpoint')
+                if endpoint == '/health' or endpoint in migrated:
+                    continue
+                self.locations_dir.mkdir(parents=True, exist_ok=True)
+                self._location_file(endpoint).write_text(textwrap.dedent(match.group('block')).strip() + "\n")
+                migrated.add(endpoint)
+            
+            config = INLINE_LOCATION_PATTERN.sub(
+                lambda m: m.group(0) if m.group('endpoint') == '/health' else '', config
+            )
+            
+            # Drop the commented HTTPS server and its commented location copies
+            https_match = HTTPS_SERVER_PATTERN.search(config)
+            if https_match and not re.search(r'^\s*listen\s+443\s+ssl', https_match.group(0), re.MULTILINE):
+                config = config[:https_match.start()] + HTTPS_SERVER_STUB + config[https_match.end():]
+            
+            # Include the shared locations in every active server
+            config = re.sub(
+                r'^([ \t]*)(server_name[^\n]*\n)',
+                lambda m: (
+                    f"{m.group(1)}{m.group(2)}{m.group(1)}\n"
+                    f"{m.group(1)}# Proxy locations (shared by the HTTP and HTTPS servers)\n"
+                    f"{m.group(1)}{LOCATIONS_INCLUDE}\n"
+                ),
+                config,
+                flags=re.MULTILINE,
+            )
+            
+            return self._write_config(config)
+        
+        except Exception as e:
+            print(f"Error migrating locations: {e}")
+            return False
+    
     def proxy_exists(self, endpoint: str) -> bool:
         """Check if a proxy configuration already exists for the endpoint."""
-        config = self._read_config()
+        config = self._read_config() + "\n" + self._read_locations()
         # Look for location block with this endpoint
         pattern = rf'location\s+{re.escape(endpoint)}\s*{{'
         return bool(re.search(pattern, config))
@@ -122,6 +223,10 @@ class NginxManager:
             config = self._read_config()
             upstream_name = self._parse_upstream_name(base_url)
             
+            # Locations are included by both the HTTP and HTTPS servers
+            if self.needs_migration():
+                raise Exception(MIGRATION_HINT)
+            
             # Store the original base_url as a comment in upstream for later retrieval
             upstream_comment = f"# Upstream for {base_url}"
             
@@ -152,30 +257,14 @@ class NginxManager:
                 
                 config = config[:insert_pos] + "\n" + upstream_block + "\n" + config[insert_pos:]
             
-            # Add location blocks to both HTTP and HTTPS servers
-            location_block = self._generate_location_block(endpoint, base_url, upstream_name, name)
-            
-            # Add to HTTP server (find the OpenAI location block and add after it)
-            http_pattern = r'(# OpenAI API proxy\n\s*location /openai/ \{[^}]+\})'
-            http_match = re.search(http_pattern, config, re.DOTALL)
-            
-            if http_match:
-                insert_pos = http_match.end()
-                config = config[:insert_pos] + location_block + config[insert_pos:]
-            else:
-                raise Exception("Could not find HTTP server section to insert location")
-            
-            # Add to HTTPS server (commented section) if it exists
-            https_pattern = r'(#\s*# OpenAI API proxy \(same as HTTP\)\n\s*#\s*location /openai/ \{[^}]+\})'
-            https_match = re.search(https_pattern, config, re.DOTALL)
+            if not self._write_config(config):
+                return False
             
-            if https_match:
-                # Generate commented version of location block for HTTPS
-                https_location_block = "\n".join(f"    #{line}" for line in location_block.split("\n"))
-                insert_pos = https_match.end()
-                config = config[:insert_pos] + https_location_block + config[insert_pos:]
-            
-            return self._write_config(config)
+            # Write the location block to its own include file shared by both servers
+            location_block = self._generate_location_block(endpoint, base_url, upstream_name, name)
+            self.locations_dir.mkdir(parents=True, exist_ok=True)
+            self._location_file(endpoint).write_text(textwrap.dedent(location_block).strip() + "\n")
+            return True
         
         except Exception as e:
             print(f"Error adding proxy: {e}")
@@ -184,13 +273,18 @@ class NginxManager:
     def remove_proxy(self, endpoint: str) -> bool:
         """Remove a proxy configuration."""
         try:
+            # Remove the location include file
+            location_file = self._location_file(endpoint)
+            if location_file.exists():
+                location_file.unlink()
+            
             config = self._read_config()
             
-            # Remove location block from HTTP server
+            # Remove legacy inline location block from HTTP server
             location_pattern = rf'\s*# [^\n]*\n\s*location\s+{re.escape(endpoint)}\s*\{{[^}}]+\}}'
             config = re.sub(location_pattern, '', config, flags=re.DOTALL)
             
-            # Remove location block from HTTPS server (commented)
+            # Remove legacy location block from HTTPS server (commented)
             https_location_pattern = rf'\s*#\s*# [^\n]*\n(\s*#\s*location\s+{re.escape(endpoint)}\s*\{{[^}}]+\}})'
             config = re.sub(https_location_pattern, '', config, flags=re.DOTALL | re.MULTILINE)
             
@@ -206,11 +300,12 @@ class NginxManager:
         """List all proxy configurations."""
         try:
             config = self._read_config()
+            locations = config + "\n" + self._read_locations()
             proxies = []
             
             # Find all location blocks (excluding /openai and /health)
             location_pattern = r'# ([^\n]*)\n\s*location\s+([^\s]+)\s*\{[^}]*proxy_pass\s+[^:]+://([^/;]+)[^}]*\}'
-            matches = re.findall(location_pattern, config, re.DOTALL)
+            matches = re.findall(location_pattern, locations, re.DOTALL)
             
             for match in matches:
                 comment, endpoint, upstream = match
@@ -247,4 +342,171 @@ class NginxManager:
         
         except Exception as e:
             print(f"Error listing proxies: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def _generate_https_server_block(self, server_name: str, ticket_keys: List[str],
+                                     trusted_cert: bool = False, ocsp_stapling: bool = True,
+                                     resolver: str = DEFAULT_RESOLVER) -> str:
+        """Generate the active HTTPS server configuration block."""
+        ticket_key_lines = "\n".join(
+            f"        ssl_session_ticket_key {CONTAINER_SSL_DIR}/tickets/{key};" for key in ticket_keys
+        )
+        
+        stapling_config = ""
+        if ocsp_stapling:
+            stapling_config = """
+        
+        # OCSP stapling saves clients a round trip to the CA
+        ssl_stapling on;"""
+            if trusted_cert:
+                stapling_config += f"""
+        ssl_stapling_verify on;
+        ssl_trusted_certificate {CONTAINER_SSL_DIR}/chain.pem;"""
+            stapling_config += f"""
+        resolver {resolver} valid=300s;
+        resolver_timeout 5s;"""
+        
+        return f"""    # HTTPS server (managed by `llm-proxy tls enable`)
+    server {{
+        listen 443 ssl;
+        http2 on;
+        server_name {server_name};
+        
+        # SSL configuration
+        ssl_certificate {CONTAINER_SSL_DIR}/cert.pem;
+        ssl_certificate_key {CONTAINER_SSL_DIR}/key.pem;
+        
+        # Modern SSL configuration
+        ssl_protocols TLSv1.2 TLSv1.3;
+        ssl_ciphers ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384;
+        ssl_prefer_server_ciphers off;
+        
+        # Session resumption: cache shared by all workers plus rotated ticket keys
+        # (the first key encrypts new tickets, the rest still decrypt older ones)
+        ssl_session_cache shared:SSL:10m;
+        ssl_session_timeout 1d;
+        ssl_session_tickets on;
+{ticket_key_lines}{stapling_config}
+        
+        # Small TLS records so streamed tokens reach the client without waiting for 16k
+        ssl_buffer_size 4k;
+        
+        # HSTS
+        add_header Strict-Transport-Security "max-age=63072000" always;
+        
+        # Proxy locations (shared with the HTTP server)
+        {LOCATIONS_INCLUDE}
+        
+        # Health check endpoint
+        location /health {{
+            access_log off;
+            return 200 "healthy\\n";
+            add_header Content-Type text/plain;
+        }}
+    }}"""
+    
+    def _ticket_key_names(self, config: str) -> List[str]:
+        """Get the session ticket key files referenced by the config, newest first."""
+        pattern = rf'ssl_session_ticket_key\s+{re.escape(CONTAINER_SSL_DIR)}/tickets/([^;\s]+);'
+        return re.findall(pattern, config)
+    
+    def _create_ticket_key(self) -> str:
+        """Create a new random session ticket key file and return its name."""
+        tickets_dir = self.ssl_dir / "tickets"
+        tickets_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 80 bytes selects AES256 for ticket encryption
+        name = f"ticket-{os.urandom(4).hex()}.key"
+        key_path = tickets_dir / name
+        key_path.write_bytes(os.urandom(80))
+        key_path.chmod(0o600)
+        return name
+    
+    def _copy_ssl_file(self, source: str, name: str) -> None:
+        """Copy a certificate file into the ssl/ directory."""
+        destination = self.ssl_dir / name
+        # Re-running enable with files already in ssl/ must not copy onto itself
+        if destination.exists() and Path(source).resolve() == destination.resolve():
+            return
+        shutil.copyfile(source, destination)
+    
+    def tls_enabled(self) -> bool:
+        """Check if the HTTPS server is active."""
+        config = self._read_config()
+        return bool(re.search(r'^\s*listen\s+443\s+ssl', config, re.MULTILINE))
+    
+    def enable_tls(self, cert_path: str, key_path: str, server_name: str = "_",
+                   trusted_cert_path: Optional[str] = None, ocsp_stapling: bool = True,
+                   resolver: str = DEFAULT_RESOLVER) -> bool:
+        """Enable the HTTPS server with the given certificate and private key."""
+        try:
+            if ocsp_stapling and not resolver.strip():
+                raise ValueError("A resolver is required for OCSP stapling")
+            
+            if self.needs_migration():
+                raise Exception(MIGRATION_HINT)
+            
+            config = self._read_config()
+            https_match = HTTPS_SERVER_PATTERN.search(config)
+            if not https_match:
+                raise Exception("Could not find HTTPS server section")
+            
+            # Copy certificates to the ssl/ directory mounted into the container
+            self.ssl_dir.mkdir(parents=True, exist_ok=True)
+            self._copy_ssl_file(cert_path, "cert.pem")
+            self._copy_ssl_file(key_path, "key.pem")
+            (self.ssl_dir / "key.pem").chmod(0o600)
+            if trusted_cert_path:
+                self._copy_ssl_file(trusted_cert_path, "chain.pem")
+            
+            # Keep existing ticket keys so sessions survive re-running enable
+            ticket_keys = self._ticket_key_names(https_match.group(0)) or [self._create_ticket_key()]
+            
+            https_block = self._generate_https_server_block(
+                server_name, ticket_keys, bool(trusted_cert_path), ocsp_stapling, resolver.strip()
+            )
+            config = config[:https_match.start()] + https_block + config[https_match.end():]
+            
+            return self._write_config(config)
+        
+        except Exception as e:
+            print(f"Error enabling TLS: {e}")
+            return False
+    
+    def rotate_session_ticket_keys(self, keep: int = 3) -> bool:
+        """Add a new session ticket key and drop the oldest beyond `keep` keys."""
+        try:
+            if keep < 1:
+                raise ValueError("At least one session ticket key must be kept")
+            
+            config = self._read_config()
+            ticket_keys = self._ticket_key_names(config)
+            if not ticket_keys:
+                raise Exception("TLS is not enabled. Run `llm-proxy tls enable` first")
+            
+            ticket_keys = [self._create_ticket_key()] + ticket_keys
+            active_keys, expired_keys = ticket_keys[:keep], ticket_keys[keep:]
+            
+            ticket_key_lines = "".join(
+                f"        ssl_session_ticket_key {CONTAINER_SSL_DIR}/tickets/{key};\n" for key in active_keys
+            )
+            config = re.sub(
+                r'(?:^[ \t]*ssl_session_ticket_key[^\n]*\n)+',
+                lambda _: ticket_key_lines,
+                config,
+                count=1,
+                flags=re.MULTILINE,
+            )
+            
+            if not self._write_config(config):
+                return False
+            
+            # Only delete expired keys once nginx.conf no longer references them
+            for key in expired_keys:
+                (self.ssl_dir / "tickets" / key).unlink(missing_ok=True)
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error rotating session ticket keys: {e}")
+            return False
@@ -0,0 +1,86 @@
+"""TLS handshake and session resumption benchmark."""
+
+import socket
+import ssl
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class TLSBenchmark:
+    """Measures full and resumed TLS handshakes against the proxy."""
+
+    def __init__(self, host: str = "localhost", port: int = 443,
+                 server_name: Optional[str] = None, verify: bool = False,
+                 timeout: float = 10.0):
+        """Initialize TLSBenchmark with the target server."""
+        self.host = host
+        self.port = port
+        self.server_name = server_name or host
+        self.timeout = timeout
+
+        self.context = ssl.create_default_context()
+        if not verify:
+            # Self-signed certificates are common for local proxies
+            self.context.check_hostname = False
+            self.context.verify_mode = ssl.CERT_NONE
+        # Stay on HTTP/1.1 so the health check request below is readable
+        self.context.set_alpn_protocols(["http/1.1"])
+
+    def _handshake(self, session: Optional[ssl.SSLSession] = None) -> Tuple[float, Optional[ssl.SSLSession], bool]:
+        """Open a connection and return handshake time, session and whether it was resumed."""
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            # Time only the TLS handshake, not the TCP connect
+            start = time.perf_counter()
+            with self.context.wrap_socket(sock, server_hostname=self.server_name, session=session) as tls:
+                elapsed = time.perf_counter() - start
+                reused = tls.session_reused
+
+                # TLS 1.3 sends session tickets after the handshake, so do a
+                # round trip before grabbing the session for the next connection
+                tls.sendall(
+                    f"GET /health HTTP/1.1\r\nHost: {self.server_name}\r\n"
+                    "Connection: close\r\n\r\n".encode()
+                )
+                while tls.recv(4096):
+                    pass
+
+                return elapsed, tls.session, reused
+
+    def _summarize(self, timings: List[float]) -> Dict[str, float]:
+        """Summarize handshake timings in milliseconds."""
+        timings_ms = sorted(t * 1000 for t in timings)
+        return {
+            'count': len(timings_ms),
+            'mean_ms': statistics.mean(timings_ms),
+            'p50_ms': statistics.median(timings_ms),
+            'p95_ms': timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))],
+        }
+
+    def run(self, count: int = 20) -> Dict[str, Dict[str, float]]:
+        """Run `count` full handshakes and `count` resumption attempts."""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        full_timings = []
+        for _ in range(count):
+            elapsed, _, _ = self._handshake()
+            full_timings.append(elapsed)
+
+        _, session, _ = self._handshake()
+        resumed_timings = []
+        resumed = 0
+        for _ in range(count):
+            elapsed, new_session, reused = self._handshake(session)
+            resumed_timings.append(elapsed)
+            if reused:
+                resumed += 1
+            # Follow ticket rotation the way a real client would
+            session = new_session or session
+
+        results = {
+            'full': self._summarize(full_timings),
+            'resumed': self._summarize(resumed_timings),
+        }
+        results['resumed']['resumption_rate'] = resumed / count
+        return results
@@ -0,0 +1,18 @@
+"""Shared fixtures for tests."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def nginx_conf(tmp_path):
+    """Copy the project's nginx configuration into a temporary directory."""
+    source_dir = Path(__file__).parent.parent / "nginx"
+    nginx_dir = tmp_path / "nginx"
+    (nginx_dir / "locations").mkdir(parents=True)
+    (nginx_dir / "nginx.conf").write_text((source_dir / "nginx.conf").read_text())
+    (nginx_dir / "locations" / "openai.conf").write_text(
+        (source_dir / "locations" / "openai.conf").read_text()
+    )
+    return nginx_dir / "nginx.conf"
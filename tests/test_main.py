@@ -0,0 +1,30 @@
+"""Tests for the CLI commands."""
+
+from click.testing import CliRunner
+
+from llm_proxy_cli.docker_manager import DockerManager
+from llm_proxy_cli.main import cli
+from llm_proxy_cli.nginx_manager import NginxManager
+
+
+class TestStatus:
+    """Test cases for the status command."""
+
+    def test_status_shows_https(self, nginx_conf, tmp_path, monkeypatch):
+        """Test that status reports whether the HTTPS server is active."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(DockerManager, "get_container_status", lambda self: "Up")
+        monkeypatch.setattr(DockerManager, "test_nginx_config", lambda self: True)
+        runner = CliRunner()
+        
+        result = runner.invoke(cli, ["status"])
+        assert "HTTPS: disabled" in result.output
+        
+        cert = tmp_path / "cert.pem"
+        key = tmp_path / "key.pem"
+        cert.write_text("CERTIFICATE")
+        key.write_text("PRIVATE KEY")
+        NginxManager(str(nginx_conf)).enable_tls(str(cert), str(key))
+        
+        result = runner.invoke(cli, ["status"])
+        assert "HTTPS: enabled" in result.output
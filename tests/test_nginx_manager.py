@@ -35,4 +35,186 @@ class TestNginxManager:
         
         assert manager.proxy_exists("/openai/")
         assert manager.proxy_exists("/claude/")
-        assert not manager.proxy_exists("/gpt/")
\ No newline at end of file
+        assert not manager.proxy_exists("/gpt/")
+
+
+class TestSharedLocations:
+    """Test cases for proxy locations shared by the HTTP and HTTPS servers."""
+
+    def test_add_proxy_writes_location_file(self, nginx_conf):
+        """Test that proxies are written as included location files."""
+        manager = NginxManager(str(nginx_conf))
+        
+        assert manager.add_proxy("/claude/", "https://api.anthropic.com", "Claude API")
+        
+        location = (nginx_conf.parent / "locations" / "claude.conf").read_text()
+        assert location.startswith("# Claude API\nlocation /claude/ {")
+        assert "proxy_pass https://api_anthropic_com_upstream;" in location
+        # No commented duplicates end up in nginx.conf
+        assert "location /claude/" not in nginx_conf.read_text()
+        
+        assert manager.proxy_exists("/claude/")
+        assert manager.list_proxies() == [
+            {'endpoint': '/claude/', 'target': 'https://api.anthropic.com', 'name': 'Claude API'}
+        ]
+
+    def test_similar_endpoints_use_separate_files(self, nginx_conf):
+        """Test that endpoints differing only in separators don't overwrite each other."""
+        manager = NginxManager(str(nginx_conf))
+        
+        assert manager.add_proxy("/a/b/", "https://api.anthropic.com")
+        assert not manager.proxy_exists("/a_b/")
+        assert manager.add_proxy("/a_b/", "https://api.openai.com")
+        
+        endpoints = sorted(proxy['endpoint'] for proxy in manager.list_proxies())
+        assert endpoints == ["/a/b/", "/a_b/"]
+
+    def test_migrate_inline_locations(self, tmp_path):
+        """Test that pre-existing inline locations are moved into include files."""
+        config_file = tmp_path / "nginx.conf"
+        config_file.write_text("""http {
+    # HTTP server
+    server {
+        listen 80;
+        server_name localhost;
+        
+        # Claude API
+        location /claude/ {
+            proxy_pass https://api_anthropic_com_upstream;
+        }
+        
+        # Health check endpoint
+        location /health {
+            return 200 "healthy\\n";
+        }
+    }
+
+    # HTTPS server (uncomment and configure when you have SSL certificates)
+    # server {
+    #     listen 443 ssl http2;
+    #     
+    #     # Claude API
+    #     location /claude/ {
+    #         proxy_pass https://api_anthropic_com_upstream;
+    #     }
+    # }
+}
+""")
+        manager = NginxManager(str(config_file))
+        assert manager.needs_migration()
+        assert not manager.add_proxy("/gpt/", "https://api.openai.com")
+        
+        assert manager.migrate_locations()
+        
+        config = config_file.read_text()
+        assert not manager.needs_migration()
+        assert "location /claude/" not in config
+        assert "location /health" in config
+        assert "# server {\n    #     listen 443 ssl;\n    #     http2 on;" in config
+        location = (tmp_path / "locations" / "claude.conf").read_text()
+        assert location.startswith("# Claude API\nlocation /claude/ {")
+        assert [proxy['endpoint'] for proxy in manager.list_proxies()] == ["/claude/"]
+        assert manager.add_proxy("/gpt/", "https://api.openai.com")
+
+    def test_remove_proxy_deletes_location_file(self, nginx_conf):
+        """Test that removing a proxy deletes its location file."""
+        manager = NginxManager(str(nginx_conf))
+        manager.add_proxy("/claude/", "https://api.anthropic.com")
+        
+        assert manager.remove_proxy("/claude/")
+        
+        assert not (nginx_conf.parent / "locations" / "claude.conf").exists()
+        assert not manager.proxy_exists("/claude/")
+        assert manager.proxy_exists("/openai/")
+
+
+class TestTLS:
+    """Test cases for the managed HTTPS server."""
+
+    @pytest.fixture
+    def cert_files(self, tmp_path):
+        """Create placeholder certificate and key files."""
+        cert = tmp_path / "cert.pem"
+        key = tmp_path / "key.pem"
+        cert.write_text("CERTIFICATE")
+        key.write_text("PRIVATE KEY")
+        return str(cert), str(key)
+
+    def test_enable_tls(self, nginx_conf, cert_files):
+        """Test that enabling TLS generates an active HTTPS server."""
+        manager = NginxManager(str(nginx_conf))
+        assert not manager.tls_enabled()
+        
+        assert manager.enable_tls(*cert_files, server_name="proxy.example.com")
+        
+        config = nginx_conf.read_text()
+        assert manager.tls_enabled()
+        assert "    server {\n        listen 443 ssl;\n        http2 on;" in config
+        assert "server_name proxy.example.com;" in config
+        assert "ssl_session_cache shared:SSL:10m;" in config
+        assert "ssl_session_tickets on;" in config
+        assert "ssl_stapling on;" in config
+        assert "ssl_buffer_size 4k;" in config
+        assert "resolver 1.1.1.1 8.8.8.8 valid=300s;" in config
+        # Both servers include the same locations
+        assert config.count("include locations/*.conf;") == 2
+        
+        ssl_dir = nginx_conf.parent / "ssl"
+        assert (ssl_dir / "cert.pem").read_text() == "CERTIFICATE"
+        assert (ssl_dir / "key.pem").read_text() == "PRIVATE KEY"
+        assert len(list((ssl_dir / "tickets").iterdir())) == 1
+
+    def test_enable_tls_is_idempotent(self, nginx_conf, cert_files):
+        """Test that re-enabling TLS replaces the server and keeps ticket keys."""
+        manager = NginxManager(str(nginx_conf))
+        manager.enable_tls(*cert_files)
+        ticket_keys = manager._ticket_key_names(nginx_conf.read_text())
+        
+        assert manager.enable_tls(*cert_files, ocsp_stapling=False)
+        
+        config = nginx_conf.read_text()
+        assert config.count("listen 443 ssl;") == 1
+        assert "ssl_stapling" not in config
+        assert manager._ticket_key_names(config) == ticket_keys
+
+    def test_enable_tls_custom_resolver(self, nginx_conf, cert_files):
+        """Test that the OCSP resolver can be overridden."""
+        manager = NginxManager(str(nginx_conf))
+        
+        assert manager.enable_tls(*cert_files, resolver="127.0.0.11")
+        
+        assert "resolver 127.0.0.11 valid=300s;" in nginx_conf.read_text()
+        assert not manager.enable_tls(*cert_files, resolver=" ")
+
+    def test_enable_tls_with_installed_certificates(self, nginx_conf, cert_files):
+        """Test that re-enabling TLS with the files already in ssl/ works."""
+        manager = NginxManager(str(nginx_conf))
+        manager.enable_tls(*cert_files)
+        ssl_dir = nginx_conf.parent / "ssl"
+        
+        assert manager.enable_tls(
+            str(ssl_dir / "cert.pem"), str(ssl_dir / "key.pem"), ocsp_stapling=False
+        )
+        
+        assert "ssl_stapling" not in nginx_conf.read_text()
+        assert (ssl_dir / "cert.pem").read_text() == "CERTIFICATE"
+        assert (ssl_dir / "key.pem").read_text() == "PRIVATE KEY"
+
+    def test_rotate_session_ticket_keys(self, nginx_conf, cert_files):
+        """Test that ticket key rotation prepends new keys and drops old ones."""
+        manager = NginxManager(str(nginx_conf))
+        assert not manager.rotate_session_ticket_keys()
+        
+        manager.enable_tls(*cert_files)
+        first_key = manager._ticket_key_names(nginx_conf.read_text())[0]
+        
+        assert manager.rotate_session_ticket_keys(keep=2)
+        keys = manager._ticket_key_names(nginx_conf.read_text())
+        assert len(keys) == 2 and keys[1] == first_key
+        
+        assert manager.rotate_session_ticket_keys(keep=2)
+        keys = manager._ticket_key_names(nginx_conf.read_text())
+        assert len(keys) == 2 and first_key not in keys
+        
+        tickets_dir = nginx_conf.parent / "ssl" / "tickets"
+        assert sorted(path.name for path in tickets_dir.iterdir()) == sorted(keys)
@@ -0,0 +1,71 @@
+"""Tests for tls_benchmark module."""
+
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+
+import pytest
+from llm_proxy_cli.tls_benchmark import TLSBenchmark
+
+
+@pytest.fixture
+def tls_server(tmp_path):
+    """Run a local TLS server answering health checks."""
+    if not shutil.which("openssl"):
+        pytest.skip("openssl is required to generate a test certificate")
+    
+    cert = tmp_path / "cert.pem"
+    key = tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    listener = socket.create_server(("127.0.0.1", 0))
+    listener.settimeout(0.2)
+    stopped = threading.Event()
+    
+    def serve():
+        while not stopped.is_set():
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            try:
+                with context.wrap_socket(conn, server_side=True) as tls:
+                    tls.recv(4096)
+                    tls.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 8\r\n\r\nhealthy\n")
+            except (OSError, ssl.SSLError):
+                pass
+    
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    stopped.set()
+    thread.join()
+    listener.close()
+
+
+class TestTLSBenchmark:
+    """Test cases for TLSBenchmark class."""
+
+    def test_run_resumes_sessions(self, tls_server):
+        """Test that full and resumed handshakes are measured."""
+        benchmark = TLSBenchmark("127.0.0.1", tls_server, server_name="localhost")
+        
+        results = benchmark.run(count=3)
+        
+        assert results['full']['count'] == 3
+        assert results['resumed']['count'] == 3
+        assert results['full']['mean_ms'] > 0
+        assert results['resumed']['resumption_rate'] == 1
+
+    def test_run_rejects_invalid_count(self):
+        """Test that a non-positive count is rejected."""
+        with pytest.raises(ValueError):
+            TLSBenchmark().run(count=0)